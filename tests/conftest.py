@@ -1,6 +1,7 @@
 """pytest-bdd conftest.py - Auto-discover and register step definitions for pytest-bdd."""
 
 import ast
+import datetime
 import importlib
 from pathlib import Path
 
@@ -247,6 +248,28 @@ def {wrapper_name}({params_str}):
 _discover_and_register_step_definitions()
 
 
+# Background step that marks a scenario as using the SIP phone steps
+_SIP_BACKGROUND_STEP = "the SIP server is running and operational"
+
+
+def pytest_bdd_before_scenario(request, feature, scenario):
+    """Record when a SIP scenario started, before any of its steps run.
+
+    SIP log checks filter on this timestamp. Capturing it here rather than in
+    the phone requirements Background step widens the log window to include
+    all Background setup, including phone start-up and REGISTER traffic.
+    Only scenarios that use the SIP Background are stamped, so other
+    scenarios never set up bf_context just for this hook.
+    """
+    if not any(step.name == _SIP_BACKGROUND_STEP for step in scenario.steps):
+        return
+    try:
+        bf_context = request.getfixturevalue("bf_context")
+    except pytest.FixtureLookupError:
+        return
+    bf_context.scenario_start_time = datetime.datetime.now()
+
+
 # Boardfarm device fixtures - extract devices from the devices fixture
 @pytest.fixture
 def acs(devices) -> AcsTemplate:
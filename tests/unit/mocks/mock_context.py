@@ -25,6 +25,9 @@ class MockContext:
         # Cleanup tracking
         self.original_config: dict = {}
         self.configured_phones: dict = {}
+        self.phones_by_number: dict = {}
+        self.phones_by_id: dict = {}
+        self.registered_users: Optional[Any] = None
         
         # Timing
         self.scenario_start_time: Optional[datetime.datetime] = None
@@ -32,6 +35,7 @@ class MockContext:
         # Additional context for scenarios
         self.call_immediately_disconnected: bool = False
         self.disconnect_reason: str = ""
+        self.sip_messages_seen: set = set()
         self.busy_maker: Optional[Any] = None
     
     def set_caller(self, phone: Any) -> None:
@@ -1,12 +1,18 @@
 """Unit tests for SIP phone step definitions."""
 
+import datetime
 import inspect
+import logging
+from types import SimpleNamespace
 
 import pytest
 from unittest.mock import patch
 
 # Import the step definition functions to be tested
 from tests.step_defs.sip_phone_steps import (
+    _SIP_TIMEOUT_MAX,
+    _env_int,
+    _rtp_ports_in_use,
     assign_caller_callee_roles,
     both_phones_connected,
     both_phones_return_to_idle,
@@ -14,8 +20,10 @@ from tests.step_defs.sip_phone_steps import (
     caller_plays_busy_tone,
     discover_available_sip_phones_from_devices,
     ensure_phone_registered,
+    get_call_pair,
     get_phone_by_name,
     get_phone_by_role,
+    get_phone_network_location,
     map_phones_to_requirements,
     phone_answers_call,
     phone_calls_number,
@@ -27,11 +35,16 @@ from tests.step_defs.sip_phone_steps import (
     phone_plays_busy_tone,
     phone_plays_dial_tone,
     phone_starts_ringing,
+    phone_timeout,
+    rtp_session_established,
     sip_server_is_running,
     sip_server_sends_response,
+    sip_server_sends_timeout,
+    sip_server_terminates_call,
     validate_use_case_phone_requirements,
     verify_phone_state,
     verify_rtp_session,
+    verify_sip_message_in_logs,
     wait_for_phone_state,
 )
 from tests.unit.mocks import MockContext, MockSIPPhone, MockSIPServer, MockDevices
@@ -83,6 +96,21 @@ def test_get_phone_by_role_invalid(bf_context: MockContext):
         get_phone_by_role(bf_context, "invalid_role")
 
 
+def test_get_call_pair(
+    bf_context: MockContext, lan_phone: MockSIPPhone, wan_phone: MockSIPPhone
+):
+    """Test get_call_pair() returns the caller and callee together."""
+    bf_context.caller = lan_phone
+    bf_context.callee = wan_phone
+    assert get_call_pair(bf_context) == (lan_phone, wan_phone)
+
+
+def test_get_call_pair_reports_all_missing_roles(bf_context: MockContext):
+    """Test get_call_pair() raises one error naming every missing role."""
+    with pytest.raises(ValueError, match="Caller and Callee phone not set in context"):
+        get_call_pair(bf_context)
+
+
 def test_phone_is_idle_success(bf_context: MockContext, lan_phone: MockSIPPhone):
     """Test the 'phone_is_idle' step when the phone is already idle."""
     # Arrange: Set the phone as the caller and ensure its state is idle
@@ -147,6 +175,28 @@ def test_ensure_phone_registered_failure(
         ensure_phone_registered(lan_phone, sipcenter)
 
 
+def test_ensure_phone_registered_reuses_scenario_users(
+    bf_context: MockContext,
+    lan_phone: MockSIPPhone,
+    wan_phone: MockSIPPhone,
+    sipcenter: MockSIPServer,
+):
+    """Test that registered users are fetched once per scenario."""
+    # Arrange
+    sipcenter.register_user(lan_phone.number)
+    sipcenter.register_user(wan_phone.number)
+    queries = []
+    all_users = sipcenter.get_all_users
+    sipcenter.get_all_users = lambda: queries.append(1) or all_users()
+
+    # Act
+    ensure_phone_registered(lan_phone, sipcenter, bf_context)
+    ensure_phone_registered(wan_phone, sipcenter, bf_context)
+
+    # Assert
+    assert len(queries) == 1
+
+
 # -- Tests for verify_phone_state --
 
 
@@ -253,6 +303,30 @@ def test_phone_dials_number_detects_busy(
     assert bf_context.disconnect_reason == "486 Busy Here"
 
 
+def test_phone_dials_number_detects_busy_in_bytes_output(
+    bf_context: MockContext, lan_phone: MockSIPPhone, wan_phone: MockSIPPhone
+):
+    """Test that a bytes console buffer is searched without copying it to str."""
+    # Arrange: Console spawned without an encoding returns bytes; fail on any
+    # str() conversion of the buffer
+    class _NoCopyBytes(bytes):
+        def __str__(self):
+            pytest.fail("console buffer was converted to str")
+
+    bf_context.caller = lan_phone
+    bf_context.callee = wan_phone
+    lan_phone._console.before = _NoCopyBytes(
+        b"Calling...\r\nDISCONNECTED [reason=486 (Busy Here)]"
+    )
+
+    # Act
+    _run_step(phone_dials_number, "caller", "callee", bf_context)
+
+    # Assert
+    assert bf_context.call_immediately_disconnected is True
+    assert bf_context.disconnect_reason == "486 Busy Here"
+
+
 # -- Tests for phone_answers_call --
 
 
@@ -320,6 +394,16 @@ def test_wait_for_phone_state_success(lan_phone: MockSIPPhone):
     assert result is True
 
 
+def test_wait_for_phone_state_skips_wait_when_already_in_state(lan_phone: MockSIPPhone):
+    """Test wait_for_phone_state() returns without waiting if the state already holds."""
+    # Arrange
+    lan_phone._state = "connected"
+    lan_phone.wait_for_state = lambda *args, **kwargs: pytest.fail("unexpected wait")
+
+    # Act & Assert
+    assert wait_for_phone_state(lan_phone, "connected", timeout=1) is True
+
+
 def test_wait_for_phone_state_failure(lan_phone: MockSIPPhone):
     """Test the wait_for_phone_state() helper when the state is not reached."""
     # Arrange: Configure the mock to return failure (timeout)
@@ -332,6 +416,22 @@ def test_wait_for_phone_state_failure(lan_phone: MockSIPPhone):
     assert result is False
 
 
+def test_wait_for_phone_state_expected_timeout_logs_debug(
+    lan_phone: MockSIPPhone, caplog: pytest.LogCaptureFixture
+):
+    """Test an expected timeout is logged at DEBUG rather than WARNING."""
+    # Arrange
+    lan_phone._wait_for_state_result = False
+    caplog.set_level(logging.DEBUG)
+
+    # Act
+    result = wait_for_phone_state(lan_phone, "ringing", timeout=1, expect_timeout=True)
+
+    # Assert
+    assert result is False
+    assert not [r for r in caplog.records if r.levelno >= logging.WARNING]
+
+
 # -- Tests for phone_starts_ringing --
 
 
@@ -395,6 +495,47 @@ def test_discover_available_sip_phones_from_devices(bf_context: MockContext):
     assert phone_names == {"lan_phone", "wan_phone", "wan_phone2"}
 
 
+def test_discover_available_sip_phones_from_devices_stops_when_satisfied():
+    """Test that discovery stops once the required phone counts are met."""
+    # Arrange
+    mock_devices = MockDevices()
+
+    # Act
+    discovered_phones = discover_available_sip_phones_from_devices(
+        mock_devices, required_counts={"LAN": 1, "WAN": 1}
+    )
+
+    # Assert
+    assert [name for name, _, _ in discovered_phones] == ["lan_phone", "wan_phone"]
+
+
+# -- Tests for get_phone_network_location --
+
+
+@pytest.mark.parametrize(
+    ("options", "expected"),
+    [
+        ("lan-ip-dhcp,dns-server", "LAN"),
+        ("WAN-STATIC-IP:172.25.1.2", "WAN"),
+        ("wan-static-ip:10.0.0.2,lan-dhcp", "LAN"),
+    ],
+)
+def test_get_phone_network_location_from_options(
+    lan_phone: MockSIPPhone, options: str, expected: str
+):
+    """Test that device options take precedence over the phone name."""
+    lan_phone.dev = SimpleNamespace(options=options)
+    assert get_phone_network_location("phone_a", phone=lan_phone) == expected
+
+
+def test_get_phone_network_location_name_fallback():
+    """Test the naming-convention fallback and the undeterminable case."""
+    assert get_phone_network_location("lan_phone") == "LAN"
+    assert get_phone_network_location("wan_phone2") == "WAN"
+    with pytest.raises(ValueError, match="Cannot determine network location"):
+        get_phone_network_location("sip_phone")
+
+
 # -- Tests for map_phones_to_requirements --
 
 
@@ -416,6 +557,39 @@ def test_map_phones_to_requirements_success(lan_phone: MockSIPPhone, wan_phone:
     assert mapping["use_case_wan"] == ("wan_phone_fixture", wan_phone)
 
 
+def test_map_phones_to_requirements_multiple_per_location(
+    lan_phone: MockSIPPhone, wan_phone: MockSIPPhone, wan_phone2: MockSIPPhone
+):
+    """Test that every requirement of a location gets its own phone."""
+    # Arrange
+    available = [
+        ("lan_phone_fixture", lan_phone, "LAN"),
+        ("wan_phone_fixture", wan_phone, "WAN"),
+        ("wan_phone2_fixture", wan_phone2, "WAN"),
+    ]
+    required = [("uc_lan", "LAN"), ("uc_wan_a", "WAN"), ("uc_wan_b", "WAN")]
+
+    # Act
+    mapping = map_phones_to_requirements(available, required)
+
+    # Assert
+    assert mapping == {
+        "uc_lan": ("lan_phone_fixture", lan_phone),
+        "uc_wan_a": ("wan_phone_fixture", wan_phone),
+        "uc_wan_b": ("wan_phone2_fixture", wan_phone2),
+    }
+
+
+def test_map_phones_to_requirements_no_requirements(lan_phone: MockSIPPhone):
+    """Test that an empty requirement list is rejected rather than mapped to nothing."""
+    # Arrange
+    available = [("lan_phone_fixture", lan_phone, "LAN")]
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="No phone requirements given to map"):
+        map_phones_to_requirements(available, [])
+
+
 def test_map_phones_to_requirements_insufficient_phones(wan_phone: MockSIPPhone):
     """Test the mapping of phones when there are not enough available."""
     # Arrange
@@ -427,6 +601,17 @@ def test_map_phones_to_requirements_insufficient_phones(wan_phone: MockSIPPhone)
         map_phones_to_requirements(available, required)
 
 
+def test_map_phones_to_requirements_unknown_location(lan_phone: MockSIPPhone):
+    """Test that a requirement for an unknown location is not silently dropped."""
+    # Arrange
+    available = [("lan_phone_fixture", lan_phone, "LAN")]
+    required = [("uc_lan", "LAN"), ("uc_dmz", "DMZ")]
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="uc_dmz"):
+        map_phones_to_requirements(available, required)
+
+
 def test_validate_use_case_phone_requirements_success(
     sipcenter: MockSIPServer, bf_context: MockContext
 ):
@@ -458,6 +643,117 @@ def test_validate_use_case_phone_requirements_success(
     # Verify that the scenario start time was recorded
     assert bf_context.scenario_start_time is not None
 
+    # Verify that the phones are indexed by number
+    assert bf_context.phones_by_number == {
+        mock_devices.lan_phone.number: mock_devices.lan_phone,
+        mock_devices.wan_phone.number: mock_devices.wan_phone,
+    }
+
+
+def test_validate_use_case_phone_requirements_reports_all_unregistered(
+    sipcenter: MockSIPServer, bf_context: MockContext
+):
+    """Test that every unregistered phone is reported in one assertion."""
+    # Arrange
+    datatable = [
+        ["phone_name", "network_location"],
+        ["lan_voice_phone", "LAN"],
+        ["wan_voice_phone", "WAN"],
+    ]
+    mock_devices = MockDevices()
+
+    # Act & Assert
+    with pytest.raises(AssertionError) as exc_info:
+        _run_step(
+            validate_use_case_phone_requirements,
+            sipcenter, bf_context, mock_devices, datatable,
+        )
+    assert "lan_voice_phone" in str(exc_info.value)
+    assert "wan_voice_phone" in str(exc_info.value)
+
+
+def test_validate_use_case_phone_requirements_location_case_insensitive(
+    sipcenter: MockSIPServer, bf_context: MockContext
+):
+    """Test that datatable locations are matched regardless of case."""
+    # Arrange
+    datatable = [
+        ["phone_name", "network_location"],
+        ["lan_voice_phone", "lan"],
+        ["wan_voice_phone", "Wan"],
+    ]
+    mock_devices = MockDevices()
+    sipcenter.register_user(mock_devices.lan_phone.number)
+    sipcenter.register_user(mock_devices.wan_phone.number)
+
+    # Act
+    _run_step(
+        validate_use_case_phone_requirements,
+        sipcenter, bf_context, mock_devices, datatable,
+    )
+
+    # Assert
+    assert bf_context.lan_voice_phone is mock_devices.lan_phone
+    assert bf_context.wan_voice_phone is mock_devices.wan_phone
+
+
+def test_validate_use_case_phone_requirements_rejects_unknown_location(
+    sipcenter: MockSIPServer, bf_context: MockContext
+):
+    """Test that a requirement outside LAN/WAN is rejected rather than dropped."""
+    # Arrange
+    datatable = [
+        ["phone_name", "network_location"],
+        ["lan_voice_phone", "LAN"],
+        ["dmz_phone", "DMZ"],
+    ]
+    mock_devices = MockDevices()
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="dmz_phone"):
+        _run_step(
+            validate_use_case_phone_requirements,
+            sipcenter, bf_context, mock_devices, datatable,
+        )
+
+
+def test_phone_calls_number_resolves_callee_by_number(
+    bf_context: MockContext, lan_phone: MockSIPPhone, wan_phone: MockSIPPhone
+):
+    """Test 'phone_calls_number' resolves the callee from the number index."""
+    # Arrange
+    bf_context.lan_phone = lan_phone
+    bf_context.phones_by_number = {
+        lan_phone.number: lan_phone,
+        wan_phone.number: wan_phone,
+    }
+
+    # Act
+    _run_step(phone_calls_number, "lan_phone", wan_phone.number, bf_context)
+
+    # Assert
+    assert bf_context.caller is lan_phone
+    assert bf_context.callee is wan_phone
+    assert lan_phone.last_dialed_number == wan_phone.number
+
+
+def test_phone_calls_number_falls_back_to_configured_phones(
+    bf_context: MockContext, lan_phone: MockSIPPhone, wan_phone: MockSIPPhone
+):
+    """Test 'phone_calls_number' scans mapped phones when the index misses."""
+    # Arrange
+    bf_context.lan_phone = lan_phone
+    bf_context.configured_phones = {
+        "lan_phone": ("lan_phone", lan_phone),
+        "wan_phone": ("wan_phone", wan_phone),
+    }
+
+    # Act
+    _run_step(phone_calls_number, "lan_phone", wan_phone.number, bf_context)
+
+    # Assert
+    assert bf_context.callee is wan_phone
+
 
 # -- Tests for then steps --
 
@@ -495,6 +791,25 @@ def test_both_phones_connected_failure(
         both_phones_connected(bf_context)
 
 
+def test_rtp_session_established_probes_both_phones(
+    bf_context: MockContext, lan_phone: MockSIPPhone, wan_phone: MockSIPPhone
+):
+    """Test the RTP step checks both phones and reports the one not connected."""
+    # Arrange
+    bf_context.caller = lan_phone
+    bf_context.callee = wan_phone
+    lan_phone._state = "connected"
+    wan_phone._state = "idle"
+    probed = []
+    lan_phone.is_connected = lambda: probed.append("caller") or True
+    wan_phone.is_connected = lambda: probed.append("callee") or False
+
+    # Act & Assert
+    with pytest.raises(AssertionError, match="Callee wan_phone not in connected state"):
+        rtp_session_established(bf_context)
+    assert sorted(probed) == ["callee", "caller"]
+
+
 def test_both_phones_return_to_idle_success(
     bf_context: MockContext, lan_phone: MockSIPPhone, wan_phone: MockSIPPhone
 ):
@@ -640,6 +955,41 @@ def test_phone_dials_invalid_number(bf_context: MockContext, lan_phone: MockSIPP
     assert lan_phone.last_dialed_number == "9999"
 
 
+def test_phone_timeout_returns_when_call_torn_down(
+    bf_context: MockContext, wan_phone: MockSIPPhone
+):
+    """Test 'phone_timeout' waits on the idle transition, not a fixed sleep."""
+    # Arrange
+    bf_context.callee = wan_phone
+    wan_phone._state = "ringing"
+    waits = []
+
+    def wait_for_state(state, timeout=10):
+        # The server tears the unanswered call down during the wait
+        waits.append((state, timeout))
+        wan_phone._state = "idle"
+        return True
+
+    wan_phone.wait_for_state = wait_for_state
+
+    # Act
+    with patch("tests.step_defs.sip_phone_steps.time.sleep") as mock_sleep:
+        phone_timeout("callee", bf_context)
+
+    # Assert
+    mock_sleep.assert_not_called()
+    assert waits == [("idle", _SIP_TIMEOUT_MAX)]
+
+
+def test_env_int_falls_back_on_non_integer(monkeypatch: pytest.MonkeyPatch):
+    """Test that a malformed integer setting falls back to the default."""
+    # Arrange
+    monkeypatch.setenv("BF_SIP_TIMEOUT_MAX", "35s")
+
+    # Act & Assert
+    assert _env_int("BF_SIP_TIMEOUT_MAX", 35) == 35
+
+
 def test_phone_plays_dial_tone_success(bf_context: MockContext, lan_phone: MockSIPPhone):
     """Test the 'phone_plays_dial_tone' step for success."""
     # Arrange
@@ -732,6 +1082,96 @@ def test_sip_server_sends_response_failure(
         sip_server_sends_response("404 Not Found", bf_context)
 
 
+# -- Tests for sip_server_terminates_call --
+
+
+def test_sip_server_terminates_call_skips_log_scan_without_active_calls(
+    bf_context: MockContext, sipcenter: MockSIPServer
+):
+    """Test that the BYE log scan is skipped when no calls are active."""
+    # Arrange
+    bf_context.sipcenter = sipcenter
+    sipcenter.set_active_calls(0)
+    scanned = []
+    sipcenter.verify_sip_message = lambda *args, **kwargs: scanned.append(args) or True
+
+    # Act
+    sip_server_terminates_call(bf_context)
+
+    # Assert
+    assert scanned == []
+
+
+def test_sip_server_terminates_call_scans_logs_with_active_calls(
+    bf_context: MockContext, sipcenter: MockSIPServer
+):
+    """Test that the BYE log scan runs when calls are still active."""
+    # Arrange
+    bf_context.sipcenter = sipcenter
+    sipcenter.set_active_calls(1)
+    scanned = []
+    sipcenter.verify_sip_message = lambda *args, **kwargs: scanned.append(args) or True
+
+    # Act
+    sip_server_terminates_call(bf_context)
+
+    # Assert
+    assert scanned == [("BYE",)]
+
+
+def test_sip_server_terminates_call_count_unavailable(
+    bf_context: MockContext, sipcenter: MockSIPServer, capsys
+):
+    """Test that an unavailable call count scans the logs and skips verification."""
+    # Arrange
+    bf_context.sipcenter = sipcenter
+    sipcenter.set_active_calls(-1)
+    scanned = []
+    sipcenter.verify_sip_message = lambda *args, **kwargs: scanned.append(args) or True
+
+    # Act
+    sip_server_terminates_call(bf_context)
+
+    # Assert
+    assert scanned == [("BYE",)]
+    assert "verification skipped" in capsys.readouterr().out
+
+
+def test_verify_sip_message_in_logs_reuses_seen_message(
+    bf_context: MockContext, sipcenter: MockSIPServer
+):
+    """Test that a message found since scenario start is not searched again."""
+    # Arrange
+    bf_context.scenario_start_time = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    searches = []
+    sipcenter.verify_sip_message = (
+        lambda message_type, since=None, timeout=5: searches.append(message_type) or True
+    )
+
+    # Act
+    first = verify_sip_message_in_logs(sipcenter, "BYE", bf_context)
+    second = verify_sip_message_in_logs(sipcenter, "BYE", bf_context)
+    verify_sip_message_in_logs(sipcenter, "INVITE", bf_context)
+
+    # Assert
+    assert first is second is True
+    assert searches == ["BYE", "INVITE"]
+
+
+def test_verify_sip_message_in_logs_retries_missing_message(
+    bf_context: MockContext, sipcenter: MockSIPServer
+):
+    """Test that a message not found yet is searched for again."""
+    # Arrange
+    bf_context.scenario_start_time = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    results = iter([False, True])
+    sipcenter.verify_sip_message = lambda message_type, since=None, timeout=5: next(results)
+
+    # Act / Assert
+    assert verify_sip_message_in_logs(sipcenter, "BYE", bf_context) is False
+    assert verify_sip_message_in_logs(sipcenter, "BYE", bf_context) is True
+
+
 # -- Tests for phone_plays_busy_tone --
 
 
@@ -800,33 +1240,66 @@ def test_caller_plays_busy_tone_failure(bf_context: MockContext, lan_phone: Mock
         caller_plays_busy_tone(bf_context)
 
 
-# -- Tests for verify_rtp_session --
+# -- Tests for sip_server_sends_timeout --
 
 
-def test_verify_rtp_session_success_with_udp_lowercase(lan_phone: MockSIPPhone):
-    """Test verify_rtp_session when UDP ports are detected (lowercase)."""
-    # Arrange: Simulate netstat output showing UDP ports in RTP range
-    lan_phone.before = "udp        0      0 0.0.0.0:4000            0.0.0.0:*"
-    
+def test_sip_server_sends_timeout_idle_caller_skips_hangup(
+    bf_context: MockContext, lan_phone: MockSIPPhone
+):
+    """Test that an already idle caller is neither waited on nor hung up."""
+    # Arrange
+    bf_context.caller = lan_phone
+    lan_phone.wait_for_state = lambda *a, **kw: pytest.fail("should not wait")
+    lan_phone.hangup = lambda: pytest.fail("should not hang up")
+
+    # Act & Assert: No exception should be raised
+    sip_server_sends_timeout(bf_context)
+
+
+def test_sip_server_sends_timeout_hangs_up_ringing_caller(
+    bf_context: MockContext, lan_phone: MockSIPPhone
+):
+    """Test that a caller still ringing is hung up and returns to idle."""
+    # Arrange
+    bf_context.caller = lan_phone
+    lan_phone._state = "ringing"
+
     # Act
-    result = verify_rtp_session(lan_phone)
-    
+    sip_server_sends_timeout(bf_context)
+
     # Assert
-    assert result is True
-    assert len(lan_phone._sendline_commands) == 1
-    assert "netstat -un" in lan_phone._sendline_commands[0]
+    assert lan_phone.is_idle()
+
+
+# -- Tests for verify_rtp_session --
+
+
+def _proc_net_udp(*ports: int) -> str:
+    """Build /proc/net/udp output with one socket line per local port."""
+    lines = [
+        "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when "
+        "retrnsmt   uid  timeout inode ref pointer drops"
+    ]
+    for index, port in enumerate(ports):
+        lines.append(
+            f"  {index}: 00000000:{port:04X} 00000000:0000 07 00000000:00000000 "
+            f"00:00000000 00000000     0        0 1234{index} 2 0000000000000000 0"
+        )
+    return "\n".join(lines)
 
 
-def test_verify_rtp_session_success_with_udp_uppercase(lan_phone: MockSIPPhone):
-    """Test verify_rtp_session when UDP ports are detected (uppercase)."""
-    # Arrange: Simulate netstat output with uppercase UDP
-    lan_phone.before = "UDP        0      0 0.0.0.0:4050            0.0.0.0:*"
+def test_verify_rtp_session_success_with_rtp_port(lan_phone: MockSIPPhone):
+    """Test verify_rtp_session when a UDP port in the RTP range is open."""
+    # Arrange: Simulate /proc/net/udp with a socket on port 4000
+    lan_phone.before = _proc_net_udp(4000)
     
     # Act
     result = verify_rtp_session(lan_phone)
     
     # Assert
     assert result is True
+    assert len(lan_phone._sendline_commands) == 1
+    assert "/proc/net/udp" in lan_phone._sendline_commands[0]
 
 
 def test_verify_rtp_session_success_null_audio_mode(lan_phone: MockSIPPhone):
@@ -858,20 +1331,13 @@ def test_verify_rtp_session_handles_exception(lan_phone: MockSIPPhone):
     assert result is True
 
 
-def test_verify_rtp_session_checks_correct_port_range(lan_phone: MockSIPPhone):
-    """Test that verify_rtp_session checks for ports in range 4000-4999."""
-    # Arrange
-    lan_phone.before = "udp        0      0 0.0.0.0:4999            0.0.0.0:*"
-    
-    # Act
-    result = verify_rtp_session(lan_phone)
+def test_rtp_ports_in_use_checks_correct_port_range():
+    """Test that only ports in range 4000-4999 count as RTP ports."""
+    # Arrange: SIP signalling (5060) and ports just outside the range
+    output = _proc_net_udp(3999, 4000, 4050, 4999, 5000, 5060)
     
-    # Assert
-    assert result is True
-    # Verify the regex pattern includes the correct port range
-    command = lan_phone._sendline_commands[0]
-    assert "4000" in command or "400[0-9]" in command
-    assert "4999" in command or "4[1-9][0-9]{2}" in command
+    # Act & Assert
+    assert _rtp_ports_in_use(output) == [4000, 4050, 4999]
 
 
 # =========================================================================